@@ -15,6 +15,7 @@
 
 """Euclidean projections."""
 
+import functools
 from typing import Any
 
 import jax
@@ -23,6 +24,7 @@ import jax.numpy as jnp
 import optax.tree
 
 
+@functools.partial(jax.jit, inline=True)
 def projection_non_negative(tree: Any) -> Any:
   r"""Projection onto the non-negative orthant.
 
@@ -42,6 +44,7 @@ def projection_non_negative(tree: Any) -> Any:
   return jax.tree.map(jax.nn.relu, tree)
 
 
+@functools.partial(jax.jit, inline=True)
 def projection_box(tree: Any, lower: Any, upper: Any) -> Any:
   r"""Projection onto box constraints.
 
@@ -62,9 +65,16 @@ def projection_box(tree: Any, lower: Any, upper: Any) -> Any:
   Returns:
     projected tree, with the same structure as ``tree``.
   """
+  # A scalar bound is repeated over the structure of `tree`; each `jnp.clip`
+  # broadcasts it.
+  if jax.tree_util.treedef_is_leaf(jax.tree.structure(lower)):
+    lower = jax.tree.map(lambda _: lower, tree)
+  if jax.tree_util.treedef_is_leaf(jax.tree.structure(upper)):
+    upper = jax.tree.map(lambda _: upper, tree)
   return jax.tree.map(jnp.clip, tree, lower, upper)
 
 
+@functools.partial(jax.jit, inline=True)
 def projection_hypercube(tree: Any, scale: Any = 1) -> Any:
   r"""Projection onto the (unit) hypercube.
 
@@ -90,17 +100,39 @@ def projection_hypercube(tree: Any, scale: Any = 1) -> Any:
   return projection_box(tree, lower=0, upper=scale)
 
 
+def _projection_unit_simplex_bisect(values: jax.typing.ArrayLike) -> jax.Array:
+  """Projection onto the unit simplex by bisection on the threshold.
+
+  The projection is ``relu(values - t)`` where ``t`` is the unique scalar such
+  that ``sum(relu(values - t)) = 1`` (Chen & Ye, 2011). Working on
+  ``z = values - max(values)``, the threshold lies in ``[-1, 0)``, so it is
+  located by a fixed number of bisection steps, each a single O(n) reduction.
+  The threshold is then recomputed exactly on the support ``z > lo``, which
+  always contains the argmax.
+  """
+  s = 1
+  z = jnp.asarray(values)
+  z = z - jnp.max(z)
+
+  def body_fun(_, carry):
+    lo, hi = carry
+    mid = (lo + hi) / 2
+    f = jnp.sum(jax.nn.relu(z - mid)) - s
+    return jnp.where(f > 0, mid, lo), jnp.where(f > 0, hi, mid)
+
+  lo, _ = jax.lax.fori_loop(
+      0, 50, body_fun, (jnp.full((), -s, z.dtype), jnp.zeros((), z.dtype))
+  )
+  support = z > lo
+  support_sum = jnp.sum(jnp.where(support, z, 0))
+  threshold = (support_sum - s) / jnp.sum(support.astype(jnp.int32))
+  return jax.nn.relu(z - threshold)
+
+
 @jax.custom_jvp
 def _projection_unit_simplex(values: jax.typing.ArrayLike) -> jax.Array:
   """Projection onto the unit simplex."""
-  s = 1
-  n_features = values.shape[0]
-  u = jnp.sort(values)[::-1]
-  cumsum_u = jnp.cumsum(u)
-  ind = jnp.arange(n_features) + 1
-  cond = s / ind + (u - cumsum_u / ind) > 0
-  idx = jnp.count_nonzero(cond)
-  return jax.nn.relu(s / idx + (values - cumsum_u[idx - 1] / idx))
+  return _projection_unit_simplex_bisect(values)
 
 
 @_projection_unit_simplex.defjvp
@@ -109,13 +141,26 @@ def _projection_unit_simplex_jvp(
 ) -> tuple[jax.Array, jax.Array]:
   (values,) = primals
   (values_dot,) = tangents
-  primal_out = _projection_unit_simplex(values)
+  primal_out = _projection_unit_simplex_bisect(values)
   supp = primal_out > 0
-  card = jnp.count_nonzero(supp)
-  tangent_out = supp * values_dot - (jnp.dot(supp, values_dot) / card) * supp
+  card = jnp.sum(supp.astype(primal_out.dtype))
+  # The tangent is linear in `values_dot` and only depends on the primal
+  # through `supp` and `card`, so reverse mode (which transposes this rule)
+  # reuses them as residuals without recomputing the projection. A custom_vjp
+  # would lose forward-mode differentiation (jax.jvp, jax.jacfwd).
+  tangent_out = supp * (values_dot - jnp.dot(supp, values_dot) / card)
   return primal_out, tangent_out
 
 
+@functools.partial(jax.jit, inline=True)
+def _projection_simplex_flat(
+    values: jax.Array, scale: jax.typing.ArrayLike
+) -> jax.Array:
+  """Projection of a flat vector onto the simplex of size ``scale``."""
+  return scale * _projection_unit_simplex(values / scale)
+
+
+@functools.partial(jax.jit, inline=True)
 def projection_simplex(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   r"""Projection onto a simplex.
 
@@ -152,10 +197,10 @@ def projection_simplex(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   .. versionadded:: 0.2.3
   """
   values, unravel_fn = flatten_util.ravel_pytree(tree)
-  new_values = scale * _projection_unit_simplex(values / scale)
-  return unravel_fn(new_values)
+  return unravel_fn(_projection_simplex_flat(values, scale))
 
 
+@functools.partial(jax.jit, inline=True)
 def projection_l1_sphere(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   r"""Projection onto the l1 sphere.
 
@@ -174,12 +219,12 @@ def projection_l1_sphere(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   Returns:
     projected tree, with the same structure as ``tree``.
   """
-  tree_abs = jax.tree.map(jnp.abs, tree)
-  tree_sign = jax.tree.map(jnp.sign, tree)
-  tree_abs_proj = projection_simplex(tree_abs, scale)
-  return optax.tree.mul(tree_sign, tree_abs_proj)
+  values, unravel_fn = flatten_util.ravel_pytree(tree)
+  abs_values_proj = _projection_simplex_flat(jnp.abs(values), scale)
+  return unravel_fn(jnp.sign(values) * abs_values_proj)
 
 
+@functools.partial(jax.jit, inline=True)
 def projection_l1_ball(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   r"""Projection onto the l1 ball.
 
@@ -211,15 +256,16 @@ def projection_l1_ball(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
 
   .. versionadded:: 0.2.4
   """
-  l1_norm = optax.tree.norm(tree, ord=1)
-  return jax.lax.cond(
-      l1_norm <= scale,
-      lambda tree: tree,
-      lambda tree: projection_l1_sphere(tree, scale),
-      operand=tree,
-  )
+  values, unravel_fn = flatten_util.ravel_pytree(tree)
+  l1_norm = jnp.sum(jnp.abs(values))
+  # Select rather than branch, so that this fuses under jit and vmap. The
+  # sphere projection is taken at radius `scale` (not `min(l1_norm, scale)`) to
+  # keep it well defined, and differentiable, at the origin.
+  values_proj = projection_l1_sphere(values, scale)
+  return unravel_fn(jnp.where(l1_norm <= scale, values, values_proj))
 
 
+@functools.partial(jax.jit, inline=True)
 def projection_l2_sphere(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   r"""Projection onto the l2 sphere.
 
@@ -244,6 +290,7 @@ def projection_l2_sphere(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   return optax.tree.scale(factor, tree)
 
 
+@functools.partial(jax.jit, inline=True)
 def projection_l2_ball(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   r"""Projection onto the l2 ball.
 
@@ -269,6 +316,7 @@ def projection_l2_ball(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   return optax.tree.scale(factor, tree)
 
 
+@functools.partial(jax.jit, inline=True)
 def projection_linf_ball(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   r"""Projection onto the l-infinity ball.
 
@@ -287,9 +335,7 @@ def projection_linf_ball(tree: Any, scale: jax.typing.ArrayLike = 1) -> Any:
   Returns:
     projected tree, with the same structure as ``tree``.
   """
-  lower = optax.tree.full_like(tree, -scale)
-  upper = optax.tree.full_like(tree, scale)
-  return projection_box(tree, lower=lower, upper=upper)
+  return jax.tree.map(lambda x: jnp.clip(x, -scale, scale), tree)
 
 
 def projection_vector(x: Any, a: Any) -> Any:
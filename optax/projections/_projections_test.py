@@ -95,6 +95,13 @@ class ProjectionsTest(parameterized.TestCase):
           (expected, expected),
       )
 
+    with self.subTest('lower and upper are scalars, tree is a pytree'):
+      tree = (-1.0, {'k1': 2.0, 'k2': (2.0, 3.0)}, 3.0)
+      expected = (0.0, {'k1': 2.0, 'k2': (2.0, 2.0)}, 2.0)
+      test_utils.assert_trees_all_equal(
+          proj.projection_box(tree, lower, upper), expected
+      )
+
     with self.subTest('lower and upper are pytrees'):
       tree = (-1.0, {'k1': 2.0, 'k2': (2.0, 3.0)}, 3.0)
       expected = (0.0, {'k1': 2.0, 'k2': (2.0, 2.0)}, 2.0)
@@ -121,6 +128,11 @@ class ProjectionsTest(parameterized.TestCase):
           proj.projection_hypercube(x, scales), expected
       )
 
+    with self.subTest('with scalar scale and a tuple'):
+      test_utils.assert_trees_all_equal(
+          proj.projection_hypercube((x, x), 0.8), (expected, expected)
+      )
+
   @parameterized.parameters(1.0, 0.8)
   def test_projection_simplex_array(self, scale):
     rng = np.random.RandomState(0)
@@ -144,6 +156,30 @@ class ProjectionsTest(parameterized.TestCase):
         p, jnp.array([scale / 2, scale / 2, 0.0])
     )
 
+  def test_projection_simplex_large_offset(self):
+    with self.subTest('with a large entry'):
+      p = proj.projection_simplex(jnp.array([1e8, 0.0]))
+      np.testing.assert_array_equal(p, jnp.array([1.0, 0.0]))
+
+    with self.subTest('with a large constant shift'):
+      p = proj.projection_simplex(jnp.full(5, 1000.0))
+      np.testing.assert_array_equal(p, jnp.full(5, 0.2))
+
+  def test_projection_simplex_tiny_scale(self):
+    p = proj.projection_simplex(jnp.array([1.0, 2.0, 3.0]), 1e-9)
+    self.assertTrue(jnp.all(jnp.isfinite(p)))
+    np.testing.assert_allclose(jnp.sum(p), 1e-9, rtol=1e-5)
+
+  @parameterized.parameters(
+      (proj.projection_l1_sphere,), (proj.projection_l1_ball,)
+  )
+  def test_projection_l1_large_input_tiny_scale(self, proj_fun):
+    rng = np.random.RandomState(0)
+    x = 100 * rng.randn(100).astype(np.float32)
+    p = proj_fun(x, 1e-6)
+    self.assertTrue(jnp.all(jnp.isfinite(p)))
+    np.testing.assert_allclose(optax.tree.norm(p, ord=1), 1e-6, rtol=1e-5)
+
   def test_projection_simplex_jacobian(self):
     rng = np.random.RandomState(0)
 
@@ -229,11 +265,28 @@ class ProjectionsTest(parameterized.TestCase):
       p = proj_fun(x, small_radius)
       np.testing.assert_almost_equal(norm_fun(p), small_radius, decimal=4)
 
+  def test_projection_l1_ball_vmap(self):
+    rng = np.random.RandomState(0)
+    x = rng.randn(4, 20).astype(np.float32)
+    scales = jnp.array([0.5, 1.0, 100.0, 1000.0])
+
+    p = jax.vmap(proj.projection_l1_ball)(x, scales)
+    expected = jnp.stack(
+        [proj.projection_l1_ball(xi, si) for xi, si in zip(x, scales)]
+    )
+    np.testing.assert_array_almost_equal(p, expected)
+    np.testing.assert_array_almost_equal(p[2:], x[2:])
+
   def test_projection_l2_ball_grad_at_zero(self):
     grad = jax.grad(proj.projection_l2_ball)(0.0)
     assert not jnp.isnan(grad)
     assert grad == 1.0
 
+  def test_projection_l2_ball_zero_tree(self):
+    tree = {'w': jnp.zeros(3), 'b': jnp.zeros(())}
+    p = proj.projection_l2_ball(tree)
+    test_utils.assert_trees_all_equal(p, tree)
+
   def test_projection_l1_ball_grad_at_zero(self):
     grad = jax.grad(proj.projection_l1_ball)(0.0)
     assert not jnp.isnan(grad)